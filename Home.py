@@ -1,7 +1,14 @@
 # Home.py — 멀티페이지 진입
 import streamlit as st
 
+import perf
+import portal
+
 st.set_page_config(page_title="수업 포털", page_icon="📚", layout="wide")
+perf.start_rerun("home")
+perf.render_panel()
+# 무거운 모듈(altair·openai 등)과 DB 연결을 백그라운드에서 미리 준비(프로세스당 1회)
+portal.prewarm()
 
 # 실제 파일 경로(여기만 여러분 레포 구조에 맞게 수정)
 GRAPH_PAGE = "pages/1_📈열에너지_그래프.py"   # ex) pages/1_📈열에너지_그래프.py
@@ -31,3 +38,5 @@ with c2:
             st.switch_page(ASSESS_PAGE)
         except Exception:
             st.warning("좌측 사이드바에서 ‘서술형 평가’ 페이지를 선택하세요.")
+
+perf.finish_rerun()
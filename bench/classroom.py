@@ -0,0 +1,312 @@
+# classroom.py — 학급 단위(30–40명) 동시 사용 부하 테스트 / 벤치마크
+# -------------------------------------------------------------------------
+# Streamlit AppTest로 Home.py와 두 페이지를 헤드리스로 구동합니다.
+#  - DB: 로컬 MySQL 스탠드인(bench/schema.sql). 운영 SQL이 MySQL 전용 구문
+#        (ON DUPLICATE KEY UPDATE, information_schema 등)을 쓰므로 SQLite는 지원하지 않습니다.
+#  - LLM: bench/stub_openai.py 스텁 서버(지연 시간 설정 가능)
+#
+# 예)
+#   docker run -d -p 3306:3306 -e MYSQL_ROOT_PASSWORD=pw -e MYSQL_DATABASE=pr mysql:8
+#   python bench/classroom.py --db-url mysql+pymysql://root:pw@127.0.0.1:3306/pr --init-db \
+#       --students 36 --workers 8 --llm-latency 1.5 --label v1
+#   python bench/classroom.py ... --label v2 --compare bench/results/v1.json
+#
+# 학생 1명 흐름: Home → 그래프 페이지 열기 → 제출 버튼(빈 칸으로 거부됨) → 그래프 저장(graph.save)
+#               → 대시보드 새로고침(--reloads회) → 서술형 페이지 열기 → 채점 받기
+# ※ AppTest는 st.data_editor 입력을 지원하지 않아 페이지에서 실제 제출을 할 수 없습니다.
+#   제출 버튼 리런은 입력 검증에서 거부되므로 graph.submit_rejected로 따로 집계하고,
+#   저장은 페이지의 제출 경로와 같은 portal.register_student / upsert_graph / invalidate_activity를
+#   직접 호출해 graph.save로 집계합니다(학생 확인·UPSERT·해당 차시 캐시 무효화, 리런 없음).
+#   AppTest는 같은 프로세스에서 실행되므로 이후 graph.reload는 페이지와 같은 캐시 상태를 봅니다.
+#
+# 각 워커는 별도 프로세스입니다(AppTest가 런타임/secrets를 전역으로 교체하므로 스레드 동시 실행 불가).
+# 따라서 st.cache_data는 워커 단위로 공유되며, 실제 서버(단일 프로세스)보다 캐시 적중률이 낮게 나옵니다.
+#
+# 결과: bench/results/<label>.json — 시나리오별 p50/p95 리런 지연, 리런당 DB 쿼리 수, 최대 메모리
+# -------------------------------------------------------------------------
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+import stub_openai  # noqa: E402
+
+HOME = os.path.join(ROOT, "Home.py")
+GRAPH_PAGE = os.path.join(ROOT, "pages", "1_📈열에너지_그래프.py")
+ASSESS_PAGE = os.path.join(ROOT, "pages", "2_🧪서술형_평가.py")
+ACTIVITY_ID = "2025-heat-curve-01"
+
+ANSWERS = {
+    "ans1": "(가)와 (다)는 열에너지를 흡수하는 상태 변화이고, (나)와 (라)는 열에너지를 방출하는 상태 변화이다. "
+            "분류 기준은 상태 변화가 일어날 때 열에너지를 흡수하는지 방출하는지이다.",
+    "ans2a": "쇳물은 액체에서 고체로 상태가 변한다. 이때 입자의 종류와 개수는 변하지 않고 "
+             "입자 사이의 거리는 가까워지며 입자 배열은 규칙적으로 바뀐다.",
+    "ans2b": "4단계에서 쇳물이 굳는 것은 응고이며, 응고가 일어날 때 쇳물은 주위로 열에너지를 방출한다.",
+    "ans3": "첫째, 캔을 젖은 수건으로 감싸 두면 물이 기체로 증발하면서 주위의 열을 흡수해 캔 온도가 내려간다. "
+            "둘째, 얼음 상자에 캔을 넣으면 얼음이 녹아 물이 되며 열을 흡수하여 캔 주변 온도가 낮아진다.",
+}
+
+
+# ---------- 워커(프로세스) ----------
+def _secrets(db_url: str, args: Dict[str, Any]) -> Dict[str, Any]:
+    from sqlalchemy.engine import make_url
+    u = make_url(db_url)
+    return {
+        "connections": {"mysql": {"host": u.host or "127.0.0.1", "port": u.port or 3306,
+                                  "database": u.database, "user": u.username or "",
+                                  "password": u.password or ""}},
+        "OPENAI_API_KEY": "stub",
+        "OPENAI_MODEL": args["model"],
+        "OPENAI_FAST_MODEL": args["fast_model"],
+        "GRADING_MODE": args["grading_mode"],
+    }
+
+
+def _student_ids(n: int) -> List[str]:
+    # 1학년 1반부터 반당 40명씩 5자리 학번 생성(최대 360명)
+    return [f"1{c:02d}{k:02d}" for c in range(1, 10) for k in range(1, 41)][:n]
+
+
+def _worker(worker_id: int, sids: List[str], args: Dict[str, Any], start_at: float) -> Dict[str, Any]:
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    os.environ["OPENAI_BASE_URL"] = args["llm_url"]
+    os.environ["OPENAI_API_KEY"] = "stub"
+
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.orm import Session
+    from streamlit.testing.v1 import AppTest
+
+    import portal
+
+    counter = {"n": 0}
+
+    @event.listens_for(Engine, "before_cursor_execute")
+    def _count(*_a, **_kw):
+        counter["n"] += 1
+
+    secrets = _secrets(args["db_url"], args)
+    engine = create_engine(args["db_url"])
+    rng = random.Random(args["seed"] + worker_id)
+    records: List[Dict[str, Any]] = []
+
+    def measure(scenario: str, fn) -> bool:
+        counter["n"] = 0
+        t0 = time.perf_counter()
+        error = bool(fn())
+        ms = (time.perf_counter() - t0) * 1000
+        records.append({"scenario": scenario, "ms": round(ms, 2), "db_queries": counter["n"], "error": error})
+        if args["think"]:
+            time.sleep(rng.uniform(0, args["think"]))
+        return error
+
+    def run(scenario: str, at: "AppTest", action=None) -> "AppTest":
+        if action is not None:
+            action(at)
+        measure(scenario, lambda: at.run(timeout=args["timeout"]).exception)
+        return at
+
+    def new_app(path: str) -> "AppTest":
+        at = AppTest.from_file(path, default_timeout=args["timeout"])
+        for k, v in secrets.items():
+            at.secrets[k] = v
+        return at
+
+    saved: List[str] = []  # 이 워커가 저장한 학번(첫 저장 때만 차시 목록 캐시도 비움)
+
+    # 모든 워커가 같은 시각에 시작하도록 대기(동시 접속 재현)
+    time.sleep(max(0.0, start_at - time.time()))
+
+    for sid in sids:
+        name = f"학생{sid}"
+        run("home", new_app(HOME))
+
+        graph = run("graph.open", new_app(GRAPH_PAGE))
+
+        def fill_graph(at: "AppTest") -> None:
+            at.text_input[0].input(sid)
+            at.text_input[1].input(name)
+            at.button[0].click()
+        run("graph.submit_rejected", graph, fill_graph)
+
+        rows = [{"시간(분)": t, "온도(°C)": round(80 - t * rng.uniform(4, 6), 1)} for t in range(0, 11)]
+        payload = json.dumps(rows, ensure_ascii=False)
+
+        def save() -> bool:
+            # 페이지의 제출 성공 경로와 같은 순서·같은 함수(new_activity 판단만 첫 저장 여부로 대신함)
+            try:
+                with Session(engine) as s:
+                    portal.register_student(s, sid, name)
+                with Session(engine) as s:
+                    portal.upsert_graph(s, ACTIVITY_ID, sid, payload)
+            except Exception:
+                return True
+            portal.invalidate_activity(ACTIVITY_ID, new_activity=not saved)
+            saved.append(sid)
+            return False
+        measure("graph.save", save)
+
+        for _ in range(args["reloads"]):
+            run("graph.reload", graph)
+
+        assess = run("assess.open", new_app(ASSESS_PAGE))
+
+        def fill_assess(at: "AppTest") -> None:
+            at.text_input[0].input(sid)
+            for key, val in ANSWERS.items():
+                at.text_area(key=key).input(val)
+            at.button(key="btn_submit").click()
+        run("assess.grade", assess, fill_assess)
+
+    engine.dispose()
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # Linux: KB
+    return {"worker": worker_id, "records": records, "peak_rss_mb": round(peak_kb / 1024, 1)}
+
+
+def _worker_entry(payload: tuple) -> Dict[str, Any]:
+    return _worker(*payload)
+
+
+# ---------- DB 준비 ----------
+def init_db(db_url: str) -> None:
+    from sqlalchemy import create_engine, text
+    engine = create_engine(db_url)
+    with open(os.path.join(BENCH_DIR, "schema.sql"), encoding="utf-8") as f:
+        statements = [s.strip() for s in f.read().split(";")]
+    with engine.begin() as c:
+        for stmt in statements:
+            body = "\n".join(line for line in stmt.splitlines() if not line.strip().startswith("--"))
+            if body.strip():
+                c.execute(text(body))
+        c.execute(text("DELETE FROM DAT3"))
+        c.execute(text("DELETE FROM graph1"))
+        c.execute(text("DELETE FROM students"))
+    engine.dispose()
+
+
+# ---------- 집계 ----------
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    s = sorted(values)
+    k = max(0, min(len(s) - 1, int(round(q * (len(s) - 1)))))
+    return round(s[k], 1)
+
+
+def summarize(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    by: Dict[str, List[Dict[str, Any]]] = {}
+    for r in records:
+        by.setdefault(r["scenario"], []).append(r)
+    by["ALL"] = records
+    out = {}
+    for scenario, rs in by.items():
+        ms = [r["ms"] for r in rs]
+        out[scenario] = {
+            "n": len(rs),
+            "p50_ms": _pct(ms, 0.50),
+            "p95_ms": _pct(ms, 0.95),
+            "max_ms": round(max(ms), 1) if ms else 0.0,
+            "db_queries_per_rerun": round(statistics.mean(r["db_queries"] for r in rs), 2) if rs else 0.0,
+            "errors": sum(r["error"] for r in rs),
+        }
+    return out
+
+
+def print_report(result: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    base = (baseline or {}).get("summary", {})
+    print(f"\n== {result['label']} · students={result['config']['students']} "
+          f"workers={result['config']['workers']} · wall {result['wall_s']:.1f}s "
+          f"· peak RSS {result['peak_rss_mb']:.0f} MB ==")
+    print(f"{'scenario':<14}{'n':>5}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'q/rerun':>9}{'err':>5}")
+    for scenario, s in sorted(result["summary"].items(), key=lambda kv: (kv[0] == "ALL", kv[0])):
+        line = (f"{scenario:<14}{s['n']:>5}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}"
+                f"{s['max_ms']:>10.1f}{s['db_queries_per_rerun']:>9.2f}{s['errors']:>5}")
+        b = base.get(scenario)
+        if b and b["p95_ms"]:
+            line += f"   p95 {100 * (s['p95_ms'] - b['p95_ms']) / b['p95_ms']:+.0f}% vs {baseline['label']}"
+        print(line)
+
+
+def main(argv: Optional[list] = None) -> int:
+    ap = argparse.ArgumentParser(description="학급 동시 사용 부하 테스트(AppTest + 로컬 MySQL + 스텁 LLM)")
+    ap.add_argument("--db-url", required=True, help="예: mysql+pymysql://root:pw@127.0.0.1:3306/pr")
+    ap.add_argument("--init-db", action="store_true", help="schema.sql 적용 후 테이블 비우기")
+    ap.add_argument("--students", type=int, default=36)
+    ap.add_argument("--workers", type=int, default=8, help="동시 실행 프로세스 수")
+    ap.add_argument("--reloads", type=int, default=3, help="학생당 대시보드 새로고침 횟수")
+    ap.add_argument("--think", type=float, default=0.0, help="리런 사이 최대 대기(초)")
+    ap.add_argument("--timeout", type=float, default=120.0, help="리런 1회 제한 시간(초)")
+    ap.add_argument("--llm-latency", type=float, default=1.0)
+    ap.add_argument("--llm-jitter", type=float, default=0.3)
+    ap.add_argument("--borderline-rate", type=float, default=0.3)
+    ap.add_argument("--grading-mode", default="full", choices=["full", "tiered"])
+    ap.add_argument("--model", default="gpt-5")
+    ap.add_argument("--fast-model", default="gpt-5-mini")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--label", default=datetime.now().strftime("%Y%m%d-%H%M%S"))
+    ap.add_argument("--out-dir", default=os.path.join(BENCH_DIR, "results"))
+    ap.add_argument("--compare", help="비교할 이전 결과 JSON")
+    a = ap.parse_args(argv)
+
+    if a.init_db:
+        init_db(a.db_url)
+
+    stub_cfg = stub_openai.StubConfig(a.llm_latency, a.llm_jitter, a.borderline_rate, a.seed)
+    server, llm_url = stub_openai.serve(stub_cfg)
+
+    sids = _student_ids(a.students)
+    workers = max(1, min(a.workers, len(sids)))
+    shards = [sids[i::workers] for i in range(workers)]
+    args = {"db_url": a.db_url, "llm_url": llm_url, "reloads": a.reloads, "think": a.think,
+            "timeout": a.timeout, "grading_mode": a.grading_mode, "model": a.model,
+            "fast_model": a.fast_model, "seed": a.seed}
+
+    start_at = time.time() + 5.0  # 워커 프로세스 기동(streamlit import) 여유
+    with mp.get_context("spawn").Pool(workers) as pool:
+        outs = pool.map(_worker_entry, [(i, shard, args, start_at) for i, shard in enumerate(shards)])
+    wall = time.time() - start_at
+    server.shutdown()
+
+    records = [r for o in outs for r in o["records"]]
+    result = {
+        "label": a.label,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "config": {k: v for k, v in vars(a).items() if k not in ("db_url", "compare", "out_dir")},
+        "wall_s": round(wall, 2),
+        "peak_rss_mb": max(o["peak_rss_mb"] for o in outs),
+        "peak_rss_mb_by_worker": [o["peak_rss_mb"] for o in outs],
+        "llm_calls": dict(stub_cfg.calls),
+        "summary": summarize(records),
+        "records": records,
+    }
+    os.makedirs(a.out_dir, exist_ok=True)
+    path = os.path.join(a.out_dir, f"{a.label}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    baseline = None
+    if a.compare:
+        with open(a.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+    print(f"LLM calls: {result['llm_calls']}")
+    print(f"saved: {path}")
+    return 1 if result["summary"]["ALL"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
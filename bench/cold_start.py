@@ -0,0 +1,143 @@
+# cold_start.py — 콜드 스타트(컨테이너 재시작 직후 첫 요청) 시간 보고서
+# -------------------------------------------------------------------------
+# 두 가지 시나리오를 페이지마다 새 파이썬 프로세스에서 측정합니다.
+#  - fresh:     빈 프로세스 → 해당 페이지 첫 리런 완료
+#  - via_home:  같은 프로세스에서 Home 실행 → 예열(portal.prewarm) 완료 대기 → 해당 페이지 첫 리런
+#               (컨테이너 재시작 뒤 누군가 Home을 먼저 연 경우 = Home 예열의 효과)
+# 첫 리런 뒤(예열 스레드 종료 후) 무거운 모듈(altair·openai)이 로드되었는지도 함께 보고합니다.
+#
+# 예)
+#   python bench/cold_start.py --repeat 5
+#   python bench/cold_start.py --db-url mysql+pymysql://root:pw@127.0.0.1:3306/pr --label v2 \
+#       --compare bench/results/cold-v1.json
+# -------------------------------------------------------------------------
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+
+PAGES = {
+    "home": os.path.join(ROOT, "Home.py"),
+    "graph": os.path.join(ROOT, "pages", "1_📈열에너지_그래프.py"),
+    "assessment": os.path.join(ROOT, "pages", "2_🧪서술형_평가.py"),
+}
+WATCH_MODULES = ("altair", "openai", "pandas", "sqlalchemy")
+
+# 자식 프로세스에서 실행되는 측정 코드
+_PROBE = r"""
+import json, os, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r}); os.chdir({root!r})
+from streamlit.testing.v1 import AppTest
+t_import = time.perf_counter()
+secrets = json.loads({secrets!r})
+
+def app(path):
+    at = AppTest.from_file(path, default_timeout=120)
+    for k, v in secrets.items():
+        at.secrets[k] = v
+    return at
+
+warm_ms = None
+if {via_home!r}:
+    app({home!r}).run()
+    import portal
+    portal.wait_prewarm(120)
+    warm_ms = (time.perf_counter() - t_import) * 1000
+t_page = time.perf_counter()
+at = app({path!r})
+at.run()
+t_run = time.perf_counter()
+import perf, portal
+portal.wait_prewarm(120)  # Home 측정 시 예열 스레드와의 경쟁 없이 로드 상태 확인
+print(json.dumps({{
+    "import_streamlit_ms": (t_import - t0) * 1000,
+    "home_and_prewarm_ms": warm_ms,
+    "first_rerun_ms": (t_run - t_page) * 1000,
+    "total_ms": (t_run - t0) * 1000,
+    "loaded": {{m: m in sys.modules for m in {watch!r}}},
+    "startup": dict(perf.startup_items()),
+    "error": bool(at.exception),
+}}))
+"""
+
+
+def _secrets(db_url: Optional[str]) -> Dict[str, Any]:
+    if not db_url:
+        return {}
+    from sqlalchemy.engine import make_url
+    u = make_url(db_url)
+    return {"connections": {"mysql": {"host": u.host or "127.0.0.1", "port": u.port or 3306,
+                                      "database": u.database, "user": u.username or "",
+                                      "password": u.password or ""}}}
+
+
+def probe(page: str, secrets: Dict[str, Any], via_home: bool = False) -> Dict[str, Any]:
+    code = _PROBE.format(root=ROOT, path=PAGES[page], home=PAGES["home"], via_home=via_home,
+                         secrets=json.dumps(secrets), watch=WATCH_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv: Optional[list] = None) -> int:
+    ap = argparse.ArgumentParser(description="페이지별 콜드 스타트 시간 측정")
+    ap.add_argument("--db-url", help="생략하면 DB 오프라인 상태로 측정")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--label", default=datetime.now().strftime("cold-%Y%m%d-%H%M%S"))
+    ap.add_argument("--out-dir", default=os.path.join(BENCH_DIR, "results"))
+    ap.add_argument("--compare", help="비교할 이전 결과 JSON")
+    a = ap.parse_args(argv)
+
+    secrets = _secrets(a.db_url)
+    runs: Dict[str, List[Dict[str, Any]]] = {p: [probe(p, secrets) for _ in range(a.repeat)] for p in PAGES}
+    warm_runs: Dict[str, List[Dict[str, Any]]] = {
+        p: [probe(p, secrets, via_home=True) for _ in range(a.repeat)] for p in PAGES if p != "home"
+    }
+    summary = {
+        p: {
+            "median_total_ms": round(statistics.median(r["total_ms"] for r in rs), 1),
+            "median_first_rerun_ms": round(statistics.median(r["first_rerun_ms"] for r in rs), 1),
+            "median_first_rerun_via_home_ms": (
+                round(statistics.median(r["first_rerun_ms"] for r in warm_runs[p]), 1) if p in warm_runs else None
+            ),
+            "loaded_after_first_rerun": rs[-1]["loaded"],
+            "startup": rs[-1]["startup"],
+        }
+        for p, rs in runs.items()
+    }
+    result = {"label": a.label, "created_at": datetime.now().isoformat(timespec="seconds"),
+              "repeat": a.repeat, "summary": summary, "runs": runs, "via_home_runs": warm_runs}
+    os.makedirs(a.out_dir, exist_ok=True)
+    path = os.path.join(a.out_dir, f"{a.label}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+
+    base = {}
+    if a.compare:
+        with open(a.compare, encoding="utf-8") as f:
+            base = json.load(f)["summary"]
+    print(f"{'page':<12}{'total ms':>10}{'rerun ms':>10}{'via home':>10}  loaded after first rerun")
+    for p, s in summary.items():
+        loaded = ", ".join(m for m, v in s["loaded_after_first_rerun"].items() if v) or "-"
+        via = s["median_first_rerun_via_home_ms"]
+        via_txt = f"{via:>10.1f}" if via is not None else f"{'-':>10}"
+        line = f"{p:<12}{s['median_total_ms']:>10.1f}{s['median_first_rerun_ms']:>10.1f}{via_txt}  {loaded}"
+        if p in base and base[p]["median_total_ms"]:
+            b = base[p]["median_total_ms"]
+            line += f"   ({100 * (s['median_total_ms'] - b) / b:+.0f}%)"
+        print(line)
+    print(f"saved: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
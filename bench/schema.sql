@@ -0,0 +1,30 @@
+-- schema.sql — 부하 테스트용 로컬 MySQL 스탠드인(students / graph1 / DAT3)
+-- 운영 DB 구조를 앱 코드가 기대하는 범위에서 재현합니다.
+CREATE TABLE IF NOT EXISTS students (
+    id     INT PRIMARY KEY,
+    name   VARCHAR(50) NOT NULL,
+    grade  INT GENERATED ALWAYS AS (id DIV 10000) STORED,
+    class  INT GENERATED ALWAYS AS ((id DIV 100) MOD 100) STORED
+);
+
+CREATE TABLE IF NOT EXISTS graph1 (
+    activity_id  VARCHAR(64) NOT NULL,
+    id           INT NOT NULL,
+    data_json    TEXT NOT NULL,
+    submitted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (activity_id, id),
+    KEY idx_graph1_activity_submitted (activity_id, submitted_at),
+    FOREIGN KEY (id) REFERENCES students(id)
+);
+
+CREATE TABLE IF NOT EXISTS DAT3 (
+    num       INT AUTO_INCREMENT PRIMARY KEY,
+    id        VARCHAR(10) NOT NULL,
+    answer1   TEXT, feedback1 TEXT,
+    answer2   TEXT, feedback2 TEXT,
+    answer3   TEXT, feedback3 TEXT,
+    answer4   TEXT, feedback4 TEXT,
+    opinion1  TEXT,
+    time      TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_dat3_id_time (id, time)
+);
@@ -0,0 +1,122 @@
+# stub_openai.py — 부하 테스트용 OpenAI 호환 스텁 서버(/v1/chat/completions, /v1/responses)
+# -------------------------------------------------------------------------
+# 단독 실행:  python bench/stub_openai.py --port 8765 --latency 1.5 --jitter 0.5
+# 앱 연결:    OPENAI_BASE_URL=http://127.0.0.1:8765/v1  OPENAI_API_KEY=stub
+#
+# 응답은 서술형 평가 페이지의 JSON 스키마를 따르며, --borderline-rate 비율만큼
+# B/C 등급(단계형 채점에서 승급 대상)을 섞어 반환합니다.
+# -------------------------------------------------------------------------
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+CLEAR = {
+    "q1":   {"level": "A", "detected": {"grouping_correct": True, "mentions_inout": True, "criterion_sentence": True}},
+    "q2_1": {"level": "A", "detected": {"state_liq_to_sol": True, "type_const": True, "count_const": True,
+                                        "distance_decrease": True, "arrangement_regular": True}},
+    "q2_2": {"level": "A", "detected": {"state_liq_to_sol": True, "heat_release": True}},
+    "q3":   {"level": "A", "detected": {"camp_ok": 2}},
+}
+BORDERLINE = {
+    "q1":   {"level": "B", "detected": {"grouping_correct": True, "mentions_inout": True, "criterion_sentence": False}},
+    "q2_1": {"level": "C", "detected": {"state_liq_to_sol": True, "type_const": False, "count_const": False,
+                                        "distance_decrease": False, "arrangement_regular": False}},
+    "q2_2": {"level": "B", "detected": {"state_liq_to_sol": True, "heat_release": False}},
+    "q3":   {"level": "B", "detected": {"camp_ok": 1}},
+}
+
+
+class StubConfig:
+    def __init__(self, latency: float = 1.0, jitter: float = 0.0, borderline_rate: float = 0.3, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.borderline_rate = borderline_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls: Dict[str, int] = {}
+
+    def next(self, model: str) -> Tuple[float, Dict[str, Any]]:
+        with self.lock:
+            self.calls[model] = self.calls.get(model, 0) + 1
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            base = BORDERLINE if self.rng.random() < self.borderline_rate else CLEAR
+        result = {k: {**v, "feedback": "스텁 피드백입니다."} for k, v in base.items()}
+        return delay, result
+
+
+def _make_handler(cfg: StubConfig):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):  # 조용히
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            model = body.get("model", "stub")
+            delay, result = cfg.next(model)
+            time.sleep(delay)
+            content = json.dumps(result, ensure_ascii=False)
+            usage_in, usage_out = 1200, 350
+            now = int(time.time())
+            if self.path.rstrip("/").endswith("/responses"):
+                payload = {
+                    "id": f"resp_{now}", "object": "response", "created_at": now, "model": model,
+                    "status": "completed",
+                    "output": [{"type": "message", "id": "msg_stub", "role": "assistant", "status": "completed",
+                                "content": [{"type": "output_text", "text": content, "annotations": []}]}],
+                    "usage": {"input_tokens": usage_in, "output_tokens": usage_out,
+                              "total_tokens": usage_in + usage_out},
+                }
+            elif self.path.rstrip("/").endswith("/chat/completions"):
+                payload = {
+                    "id": f"chatcmpl_{now}", "object": "chat.completion", "created": now, "model": model,
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": content}}],
+                    "usage": {"prompt_tokens": usage_in, "completion_tokens": usage_out,
+                              "total_tokens": usage_in + usage_out},
+                }
+            else:
+                self.send_error(404)
+                return
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+    return Handler
+
+
+def serve(cfg: StubConfig, host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """백그라운드 스레드에서 스텁 서버를 띄우고 (server, base_url)을 반환합니다. port=0이면 임의 포트."""
+    server = ThreadingHTTPServer((host, port), _make_handler(cfg))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/v1"
+
+
+def main(argv: Optional[list] = None) -> None:
+    ap = argparse.ArgumentParser(description="OpenAI 호환 스텁 서버")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=1.0, help="응답 지연(초)")
+    ap.add_argument("--jitter", type=float, default=0.0, help="지연 ±편차(초)")
+    ap.add_argument("--borderline-rate", type=float, default=0.3)
+    args = ap.parse_args(argv)
+    server, url = serve(StubConfig(args.latency, args.jitter, args.borderline_rate), args.host, args.port)
+    print(f"stub OpenAI server: {url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# grading.py — 서술형 채점 결과 검증 · 단계형 채점 라우팅 규칙(스트림릿 비의존, 단위 테스트 대상)
+# -------------------------------------------------------------------------
+#  - expected_levels(): 루브릭 등급 매핑에 따라 detected 플래그로 허용되는 등급 계산
+#  - escalation_reasons(): 1차(경량 모델) 결과를 대형 모델로 재채점해야 하는 사유
+#  - normalize(): 등급/피드백/detected 기본값 보정
+#  - record_route() / recent_routes(): 프로세스 공용 최근 채점 라우팅 기록(모든 세션, 최근 MAX_ROUTES건)
+# -------------------------------------------------------------------------
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+
+MAX_ROUTES = 50         # 프로세스 전체에서 보관할 최근 라우팅 기록 수
+_ROUTES: Deque[Dict[str, Any]] = deque(maxlen=MAX_ROUTES)
+_ROUTES_LOCK = threading.Lock()  # 여러 세션 스레드가 동시에 기록
+
+QKEYS = ("q1", "q2_1", "q2_2", "q3")
+DETECTED_KEYS: Dict[str, Tuple[str, ...]] = {
+    "q1":   ("grouping_correct", "mentions_inout", "criterion_sentence"),
+    "q2_1": ("state_liq_to_sol", "type_const", "count_const", "distance_decrease", "arrangement_regular"),
+    "q2_2": ("state_liq_to_sol", "heat_release"),
+    "q3":   ("camp_ok",),
+}
+
+
+def expected_levels(key: str, detected: Dict[str, Any]) -> set:
+    """루브릭 등급 매핑에 따라 detected 플래그로부터 허용되는 등급 집합을 계산합니다."""
+    if key == "q3":
+        camp_ok = int(detected.get("camp_ok", 0))
+        return {2: {"A"}, 1: {"B"}}.get(camp_ok, {"B", "C", "D"})  # B: 경미한 누락 허용
+    n = sum(1 for k in DETECTED_KEYS[key] if detected.get(k) is True)
+    if key == "q1":
+        return {3: {"A"}, 2: {"B"}, 1: {"C"}}.get(n, {"D"})
+    if key == "q2_1":
+        return {"A"} if n == 5 else {"B"} if n >= 3 else {"C"} if n >= 1 else {"D"}
+    return {2: {"A"}, 1: {"B"}}.get(n, {"C", "D"})  # q2_2: 0개 → 모호(C) 또는 역방향(D)
+
+
+def escalation_reasons(data: Any) -> List[str]:
+    """1차(경량 모델) 결과를 재채점해야 하는 사유 목록. 빈 목록이면 그대로 확정합니다."""
+    if not isinstance(data, dict): return ["schema:not_object"]
+    reasons = []
+    for key in QKEYS:
+        item = data.get(key)
+        if not isinstance(item, dict): reasons.append(f"{key}:schema"); continue
+        lv = str(item.get("level", "")).upper()
+        detected = item.get("detected")
+        if lv not in ("A","B","C","D") or not isinstance(detected, dict):
+            reasons.append(f"{key}:schema"); continue
+        if key == "q3":
+            camp_ok = detected.get("camp_ok")
+            if isinstance(camp_ok, bool) or not isinstance(camp_ok, int) or not 0 <= camp_ok <= 2:
+                reasons.append(f"{key}:schema"); continue
+        elif any(not isinstance(detected.get(k), bool) for k in DETECTED_KEYS[key]):
+            reasons.append(f"{key}:schema"); continue
+        if lv in ("B", "C"): reasons.append(f"{key}:borderline")
+        elif lv not in expected_levels(key, detected): reasons.append(f"{key}:mismatch")
+    return reasons
+
+
+def normalize(data: Any) -> Dict[str, Any]:
+    """문항별 등급을 A–D로 보정하고 feedback/detected 기본값을 채웁니다."""
+    if not isinstance(data, dict): data = {}
+    for key in QKEYS:
+        item = data.get(key, {})
+        if not isinstance(item, dict): item = {}
+        lv = str(item.get("level","D")).upper()
+        if lv not in ("A","B","C","D"): lv="D"
+        item["level"]=lv; item.setdefault("feedback",""); item.setdefault("detected",{})
+        data[key]=item
+    return data
+
+
+def record_route(route: Dict[str, Any]) -> None:
+    """채점 1건의 라우팅 기록을 프로세스 공용 링 버퍼에 추가합니다(오래된 기록부터 버림)."""
+    with _ROUTES_LOCK:
+        _ROUTES.append(route)
+
+
+def recent_routes() -> List[Dict[str, Any]]:
+    """최근 라우팅 기록의 스냅샷(오래된 것 → 최근 순)."""
+    with _ROUTES_LOCK:
+        return list(_ROUTES)
@@ -0,0 +1,11 @@
+-- 001_graph1_activity_index.sql — 운영 DB 마이그레이션(1회, 수업 시간 외에 실행)
+-- 차시(activity_id)별 대시보드 조회와 차시 요약(MIN/MAX(submitted_at) ... GROUP BY activity_id)을
+-- 인덱스로 처리하기 위한 graph1 인덱스입니다. 부하 테스트 스탠드인(bench/schema.sql)도 같은 정의를 씁니다.
+--
+-- 적용 전 확인(결과가 0이면 아래 ALTER 실행):
+--   SELECT COUNT(*) FROM information_schema.statistics
+--   WHERE table_schema = DATABASE() AND table_name = 'graph1'
+--     AND index_name = 'idx_graph1_activity_submitted';
+--
+-- 실행 예) mysql -h <host> -u <user> -p <database> < migrations/001_graph1_activity_index.sql
+ALTER TABLE graph1 ADD INDEX idx_graph1_activity_submitted (activity_id, submitted_at);
@@ -12,67 +12,89 @@
 #  - (기능) 대시보드에 학년/반 필터 및 정렬 기능 추가
 #  - (기능) 학생 상세 탭에서 여러 학생 그래프 비교 기능 추가
 #  - (기능) 학생 상세 탭에 교사용 피드백 입력 및 저장 기능 추가
+#  - (기능) 여러 차시(activity_id)를 한 배포에서 운영: 차시 선택, 차시별 캐시, 차시 요약 탭
 # -------------------------------------------------------------------------
 
 import json
 import re
 import pandas as pd
-import altair as alt
 import streamlit as st
-from sqlalchemy import text
+
+import perf
+import portal
 
 # ---------- 상수 정의 (유지보수성 향상) ----------
 TIME_COL = "시간(분)"
 TEMP_COL = "온도(°C)"
-ACTIVITY_ID = "2025-heat-curve-01"  # 차시 식별자(필요 시 문자열만 교체)
+DEFAULT_ACTIVITY_ID = "2025-heat-curve-01"  # 기본 차시(secrets ACTIVITY_IDS로 목록 지정 가능)
+ACTIVITY_ID_RE = re.compile(r"[\w\-]{1,64}")
 
 # ---------- 기본 UI ----------
 st.set_page_config(page_title="열에너지 방출 그래프 그리기", layout="wide")
+perf.start_rerun("graph")
+perf.render_panel()
 st.title("열에너지 방출 그래프 그리기")
 st.caption("시간(분)과 온도(°C)를 표에 입력 → 미리보기 확인 → 제출")
 
-# ---------- DB 연결 설정 (Streamlit 권장 방식) ----------
-try:
-    db_creds = st.secrets.connections.mysql
-    conn = st.connection(
-        "mysql", type="sql", dialect="mysql",
-        host=db_creds.host, port=db_creds.port, database=db_creds.database,
-        username=db_creds.user, password=db_creds.password
-    )
-    conn.query("SELECT 1")
-    DB_STATUS = "ONLINE"
-except Exception as e:
-    conn = None
-    DB_STATUS = f"OFFLINE: {e}"
+# ---------- DB 연결 설정 (페이지 공용 연결, portal.py) ----------
+with perf.span("db.connect"):
+    conn, DB_STATUS = portal.get_connection()
 
 st.info(f"DB 상태: {DB_STATUS}")
 
-# ---------- 데이터 조회 함수 (캐싱 적용, 피드백 컬럼 추가) ----------
+# 차시별 조회/집계용 인덱스 (activity_id, submitted_at)는 migrations/001_graph1_activity_index.sql로 1회 적용합니다.
+
+# ---------- 데이터 조회 함수 (차시별 캐싱: portal.get_dashboard_data / portal.get_activity_ids) ----------
 @st.cache_data(ttl=300)
-def get_dashboard_data(activity_id):
-    """대시보드와 학생 상세 탭에 필요한 데이터를 DB에서 조회합니다."""
+def get_activity_summary():
+    """차시별 제출 현황(전체 집계). 차시 요약 탭에서 요청할 때만 실행하며 제출 시 비우지 않고 TTL로 갱신합니다."""
     if not conn:
-        return pd.DataFrame()
-
-    df = conn.query(
+        return pd.DataFrame(columns=["activity_id", "submissions", "first_submitted_at", "last_submitted_at"])
+    return conn.query(
         """
-        SELECT g1.id, s.name, s.grade, s.class, g1.submitted_at, g1.data_json
-        FROM graph1 g1
-        JOIN students s ON s.id = g1.id
-        WHERE g1.activity_id = :activity_id;
+        SELECT activity_id,
+               COUNT(*)          AS submissions,
+               MIN(submitted_at) AS first_submitted_at,
+               MAX(submitted_at) AS last_submitted_at
+        FROM graph1
+        GROUP BY activity_id
+        ORDER BY activity_id;
         """,
-        params={"activity_id": activity_id},
+        ttl=0,
     )
-    # 학번, 학년, 반을 숫자 타입으로 변환하여 정렬이 올바르게 되도록 함
-    for col in ['id', 'grade', 'class']:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-    return df.sort_values('id')
+
+
+# ---------- 차시(활동) 선택 ----------
+# 목록 = secrets의 ACTIVITY_IDS + DB에 제출이 있는 차시. ?activity=<id> 링크로 새 차시를 바로 열 수 있습니다.
+# DB가 오프라인일 때는 조회하지 않습니다(빈 목록이 1시간 동안 캐시되는 것을 막기 위해).
+stored_activity_ids = []
+if DB_STATUS == "ONLINE":
+    with perf.span("get_activity_ids"):
+        stored_activity_ids = portal.get_activity_ids()
+activity_options = list(dict.fromkeys(
+    [str(a) for a in st.secrets.get("ACTIVITY_IDS", [DEFAULT_ACTIVITY_ID])] + stored_activity_ids
+)) or [DEFAULT_ACTIVITY_ID]
+if "activity_id" not in st.session_state:
+    requested = st.query_params.get("activity", "")
+    st.session_state["activity_id"] = requested if ACTIVITY_ID_RE.fullmatch(requested) else activity_options[0]
+if st.session_state["activity_id"] not in activity_options:
+    activity_options.append(st.session_state["activity_id"])
+activity_id = st.sidebar.selectbox("차시(활동)", activity_options, key="activity_id")
+st.query_params["activity"] = activity_id
+st.caption(f"현재 차시: {activity_id}")
 
 
 # ---------- 차트 생성 함수 (신규, 코드 중복 제거) ----------
+def _alt():
+    """altair는 첫 차트를 그릴 때 불러옵니다(콜드 스타트 단축)."""
+    with perf.startup_step("import.altair"):
+        import altair as alt
+    return alt
+
+
 def create_altair_chart(df, title, height):
     """데이터프레임을 받아 Altair 꺾은선 그래프를 생성합니다."""
+    alt = _alt()
     chart = (
         alt.Chart(df)
         .mark_line(point=True, tooltip=True)
@@ -84,7 +106,7 @@ def create_altair_chart(df, title, height):
 
 
 # ---------- 탭 ----------
-tab_submit, tab_dash, tab_detail = st.tabs(["📤 제출(학생)", "📊 대시보드", "🔎 학생 상세"])
+tab_submit, tab_dash, tab_detail, tab_summary = st.tabs(["📤 제출(학생)", "📊 대시보드", "🔎 학생 상세", "🗂️ 차시 요약"])
 
 # ======================== 제출(학생) ========================
 with tab_submit:
@@ -106,8 +128,10 @@ with tab_submit:
         if not prev.empty:
             chart_title = f"학번 {sid.strip()} 이름 {name.strip()}" if sid and name else "미리보기"
             # 함수를 사용하여 차트 생성
-            ch = create_altair_chart(prev.sort_values(TIME_COL), chart_title, 280)
-            st.altair_chart(ch, use_container_width=True)
+            with perf.span("create_altair_chart"):
+                ch = create_altair_chart(prev.sort_values(TIME_COL), chart_title, 280)
+            with perf.span("st.altair_chart"):
+                st.altair_chart(ch, use_container_width=True)
             
         submitted = st.form_submit_button("제출")
         if submitted:
@@ -132,13 +156,9 @@ with tab_submit:
             
             # 학생 존재 확인 및 신규 등록
             try:
-                student_exists = conn.query("SELECT 1 FROM students WHERE id=:id", params={"id": sid})
-                if student_exists.empty:
-                    with conn.session as s:
-                        # 수정: id와 name만 INSERT합니다. grade와 class는 DB에서 자동으로 생성됩니다.
-                        s.execute(text("INSERT INTO students (id, name) VALUES (:id, :name);"), 
-                                  params={"id": sid, "name": name})
-                        s.commit()
+                with conn.session as s:
+                    registered = portal.register_student(s, sid, name)
+                if registered:
                     st.toast(f"{name} 학생을 새로 등록했습니다.")
             except Exception as e:
                 st.error(f"[DB 오류] 학생 등록 또는 확인 실패: {e}")
@@ -149,24 +169,17 @@ with tab_submit:
             payload = json.dumps(ordered.to_dict(orient="records"), ensure_ascii=False)
             try:
                 with conn.session as s:
-                    s.execute(
-                        text("""
-                        INSERT INTO graph1(activity_id, id, data_json) VALUES (:activity_id, :id, :data_json)
-                        ON DUPLICATE KEY UPDATE
-                            data_json = VALUES(data_json),
-                            submitted_at = CURRENT_TIMESTAMP
-                        """),
-                        params={"activity_id": ACTIVITY_ID, "id": sid, "data_json": payload}
-                    )
-                    s.commit()
-                st.cache_data.clear() # 제출 성공 후 캐시 초기화
+                    portal.upsert_graph(s, activity_id, sid, payload)
+                # 제출 성공 후 이 차시의 캐시만 초기화(다른 차시 캐시·차시 요약은 유지)
+                portal.invalidate_activity(activity_id, new_activity=activity_id not in stored_activity_ids)
                 st.success("제출 완료! ‘📊 대시보드’에서 전체 결과를 확인하세요.")
             except Exception as e:
                 st.error(f"[DB 오류] 저장 실패: {e}")
 
 # ======================== 공통 데이터 로딩 ========================
 if DB_STATUS == "ONLINE":
-    all_data = get_dashboard_data(ACTIVITY_ID)
+    with perf.span("get_dashboard_data"):
+        all_data = portal.get_dashboard_data(activity_id)
 else:
     all_data = pd.DataFrame()
 
@@ -206,20 +219,28 @@ with tab_dash:
         }))
         
         st.markdown("#### 미니차트")
-        cols = st.columns(3)
-        # 필터링된 데이터로 미니차트 표시
-        for i, row in enumerate(filtered_data.head(12).itertuples()):
-            with cols[i % 3]:
-                st.markdown(f"**{row.id} {row.name}**")
-                try:
-                    df_chart = pd.DataFrame(json.loads(row.data_json))
-                    if not df_chart.empty:
-                        # 함수를 사용하여 차트 생성
-                        ch = create_altair_chart(df_chart, "", 200)
-                        st.altair_chart(ch, use_container_width=True)
-                    else: st.caption("데이터 없음")
-                except (json.JSONDecodeError, TypeError):
-                    st.caption("데이터 형식 오류")
+        # 미니차트(최대 12개)는 켤 때만 그립니다. st.tabs는 모든 탭을 매 리런 실행하므로
+        # 꺼 두면 대시보드 리런에서 altair import·차트 12개 생성 비용이 들지 않습니다(콜드 스타트 단축).
+        if not st.toggle("미니차트 보기(최대 12명)", key="show_minicharts"):
+            st.caption("켜면 필터링된 학생 중 앞의 12명의 그래프를 표시합니다.")
+        else:
+            cols = st.columns(3)
+            # 필터링된 데이터로 미니차트 표시
+            for i, row in enumerate(filtered_data.head(12).itertuples()):
+                with cols[i % 3]:
+                    st.markdown(f"**{row.id} {row.name}**")
+                    try:
+                        with perf.span("json.loads"):
+                            df_chart = pd.DataFrame(json.loads(row.data_json))
+                        if not df_chart.empty:
+                            # 함수를 사용하여 차트 생성
+                            with perf.span("create_altair_chart"):
+                                ch = create_altair_chart(df_chart, "", 200)
+                            with perf.span("st.altair_chart"):
+                                st.altair_chart(ch, use_container_width=True)
+                        else: st.caption("데이터 없음")
+                    except (json.JSONDecodeError, TypeError):
+                        st.caption("데이터 형식 오류")
 
 # ======================== 학생 상세 ========================
 with tab_detail:
@@ -241,15 +262,18 @@ with tab_detail:
             
             st.markdown(f"### {record['id']} {record['name']}")
             try:
-                df_sel = pd.DataFrame(json.loads(record["data_json"]))
+                with perf.span("json.loads"):
+                    df_sel = pd.DataFrame(json.loads(record["data_json"]))
                 if not df_sel.empty:
-                    ch = create_altair_chart(df_sel, f"그래프: {record['id']} {record['name']}", 420)
-                    st.altair_chart(ch, use_container_width=True)
+                    with perf.span("create_altair_chart"):
+                        ch = create_altair_chart(df_sel, f"그래프: {record['id']} {record['name']}", 420)
+                    with perf.span("st.altair_chart"):
+                        st.altair_chart(ch, use_container_width=True)
                     st.dataframe(df_sel)
                     st.download_button(
                         "⬇️ CSV 다운로드",
                         data=df_sel.to_csv(index=False).encode("utf-8-sig"),
-                        file_name=f"{ACTIVITY_ID}_{sid_sel}.csv", mime="text/csv"
+                        file_name=f"{activity_id}_{sid_sel}.csv", mime="text/csv"
                     )
             except (json.JSONDecodeError, TypeError):
                 st.error("상세 데이터를 불러오는 데 실패했습니다.")
@@ -262,7 +286,8 @@ with tab_detail:
                 sid_sel = student_str.split("|")[0].strip()
                 record = all_data[all_data["id"] == int(sid_sel)].iloc[0]
                 try:
-                    df_student = pd.DataFrame(json.loads(record["data_json"]))
+                    with perf.span("json.loads"):
+                        df_student = pd.DataFrame(json.loads(record["data_json"]))
                     df_student['student'] = f"{record['id']} {record['name']}" # 학생 식별 컬럼 추가
                     chart_data_list.append(df_student)
                 except (json.JSONDecodeError, TypeError):
@@ -272,7 +297,7 @@ with tab_detail:
                 combined_df = pd.concat(chart_data_list, ignore_index=True)
                 
                 comparison_chart = (
-                    alt.Chart(combined_df)
+                    _alt().Chart(combined_df)
                     .mark_line(point=True, tooltip=True)
                     .encode(
                         x=f"{TIME_COL}:Q",
@@ -283,7 +308,31 @@ with tab_detail:
                     .properties(height=500, title="학생별 그래프 비교")
                     .interactive()
                 )
-                st.altair_chart(comparison_chart, use_container_width=True)
+                with perf.span("st.altair_chart"):
+                    st.altair_chart(comparison_chart, use_container_width=True)
+
+# ======================== 차시 요약 ========================
+with tab_summary:
+    # st.tabs는 모든 탭 코드를 매 리런 실행하므로, 전체 집계는 켰을 때만 조회합니다.
+    if not st.toggle("차시별 제출 현황 보기(최대 5분 전 집계)", key="show_activity_summary"):
+        st.caption("켜면 모든 차시의 제출 수와 제출 시각 범위를 집계합니다.")
+    elif DB_STATUS != "ONLINE":
+        st.warning("DB가 오프라인이라 차시별 제출 현황을 불러올 수 없습니다.")
+    else:
+        with perf.span("get_activity_summary"):
+            activity_summary = get_activity_summary()
+        if activity_summary.empty:
+            st.warning("표시할 데이터가 없습니다.")
+        else:
+            st.markdown("#### 차시별 제출 현황")
+            st.dataframe(activity_summary.rename(columns={
+                "activity_id": "차시", "submissions": "제출 수",
+                "first_submitted_at": "첫 제출", "last_submitted_at": "최근 제출",
+            }), hide_index=True)
+            st.caption("사이드바에서 차시를 선택하면 해당 차시의 대시보드로 전환됩니다.")
+
+perf.finish_rerun()
+
 
 
 
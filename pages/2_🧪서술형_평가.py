@@ -1,18 +1,27 @@
 # app.py — 서술형 평가(3문항: 2-1/2-2 포함) · 성취수준 채점(A–D) · pr.DAT3 저장 (PyMySQL/Streamlit SQL 통일)
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-import os, re, json, textwrap
+import os, re, json, time, textwrap
+from datetime import datetime
 from typing import Dict, Any, List, Tuple, Optional
 
 import streamlit as st
 from sqlalchemy import text
-from openai import OpenAI
+
+import grading
+import perf
+import portal
 
 # ───────────────────────── 페이지/모델 ─────────────────────────
 st.set_page_config(page_title="서술형 평가 — 상태 변화와 열에너지", page_icon="🧪", layout="wide")
 st.title("🧪 서술형 평가 — 상태 변화와 열에너지")
+perf.start_rerun("assessment")
 
 OPENAI_MODEL = st.secrets.get("OPENAI_MODEL", "gpt-5")
+# 단계형 채점: "tiered"이면 경량 모델이 먼저 채점하고, 불확실한 경우에만 OPENAI_MODEL로 재채점
+OPENAI_FAST_MODEL = st.secrets.get("OPENAI_FAST_MODEL", "gpt-5-mini")
+GRADING_MODE = str(st.secrets.get("GRADING_MODE", "full")).lower()   # "full" | "tiered"
+GRADING_LOG_PATH = st.secrets.get("GRADING_LOG_PATH", "")           # 예: "grading_routes.jsonl"
 if "OPENAI_API_KEY" in st.secrets and not os.environ.get("OPENAI_API_KEY"):
     os.environ["OPENAI_API_KEY"] = st.secrets["OPENAI_API_KEY"]
 
@@ -22,23 +31,30 @@ def _compile_id_regex() -> re.Pattern:
     except re.error: return re.compile(r"^\d{5,10}$")
 ID_RE = _compile_id_regex()
 
-# ───────────────────────── DB 연결 (PyMySQL/Streamlit SQL) ─────────────────────────
-try:
-    db = st.secrets.connections.mysql
-    conn = st.connection(
-        "mysql", type="sql", dialect="mysql",
-        host=db.host, port=db.port, database=db.database,
-        username=db.user, password=db.password
-    )
-    # 헬스체크
-    conn.query("SELECT 1;")
-    DB_STATUS = "ONLINE"
-except Exception as e:
-    conn = None
-    DB_STATUS = f"OFFLINE: {e}"
+# ───────────────────────── DB 연결 (페이지 공용 연결, portal.py) ─────────────────────────
+with perf.span("db.connect"):
+    conn, DB_STATUS = portal.get_connection()
 
 st.caption(f"DB 상태: {DB_STATUS}")
 
+# 교사용 성능 패널 + 최근 채점 라우팅 기록(모든 학생, 프로세스 공용)
+# 자리(st.empty)는 assert_table_exists의 st.stop() 이전에 잡아 두고, 채점 직후 다시 그려 방금 채점한 건도 표시
+route_box = st.sidebar.empty() if perf.render_panel() else None
+
+def render_routes() -> None:
+    if route_box is None: return
+    with route_box.container():
+        with st.expander("🔀 채점 라우팅(최근)", expanded=False):
+            routes = grading.recent_routes()
+            if not routes: st.caption("아직 채점 기록이 없습니다.")
+            for r in reversed(routes):
+                tiers = " → ".join(f"{t['model']} {t['latency_ms']:.0f}ms/{t['input_tokens']}+{t['output_tokens']}tok"
+                                   for t in r["tiers"])
+                reasons = f" · 승급: {', '.join(r['reasons'])}" if r["escalated"] else ""
+                st.caption(f"{r['ts']} · {tiers}{reasons}")
+
+render_routes()
+
 def assert_table_exists():
     if DB_STATUS != "ONLINE":
         st.error("DB 연결이 오프라인입니다. secrets 또는 네트워크/방화벽을 확인하세요.")
@@ -48,9 +64,8 @@ def assert_table_exists():
             """
             SELECT COUNT(*) AS cnt
             FROM information_schema.tables
-            WHERE table_schema = :db AND table_name = 'DAT3';
-            """,
-            params={"db": db.database},
+            WHERE table_schema = DATABASE() AND table_name = 'DAT3';
+            """
         )
         if df.iloc[0]["cnt"] == 0:
             st.error("DAT3 테이블이 존재하지 않습니다. 워크벤치에서 pr.DAT3를 생성해 주세요.")
@@ -59,7 +74,8 @@ def assert_table_exists():
         st.error(f"[DB 점검 실패] {e}")
         st.stop()
 
-assert_table_exists()
+with perf.span("assert_table_exists"):
+    assert_table_exists()
 
 def insert_row(row: Dict[str, Any]) -> bool:
     try:
@@ -91,9 +107,8 @@ def _has_time_column() -> bool:
             """
             SELECT COUNT(*) AS cnt
             FROM information_schema.columns
-            WHERE table_schema=:db AND table_name='DAT3' AND column_name='time';
-            """,
-            params={"db": db.database},
+            WHERE table_schema=DATABASE() AND table_name='DAT3' AND column_name='time';
+            """
         )
         return df.iloc[0]["cnt"] > 0
     except Exception:
@@ -167,7 +182,11 @@ LIMITS     = {"q1": 350, "q2a": 300, "q2b": 300, "q3": 350}
 
 # ───────────────────────── GPT 채점 ─────────────────────────
 @st.cache_resource(show_spinner=False)
-def get_openai_client(): return OpenAI()
+def get_openai_client():
+    # openai는 첫 채점 시점에 불러옵니다(문항만 보는 학생의 페이지 로딩 단축)
+    with perf.startup_step("import.openai"):
+        from openai import OpenAI
+    return OpenAI()
 
 def build_messages(payload: Dict[str,str]) -> Tuple[str,str]:
     system = (
@@ -231,14 +250,18 @@ def _parse_json_strict(txt: str) -> Dict[str, Any]:
         if m: return json.loads(m.group(0))
         raise
 
-def grade_all(q1: str, q2_1: str, q2_2: str, q3: str) -> Dict[str, Any]:
-    client = get_openai_client()
-    system, user_msg = build_messages({"q1": q1, "q2_1": q2_1, "q2_2": q2_2, "q3": q3})
+def _usage_of(resp: Any) -> Dict[str, int]:
+    usage = getattr(resp, "usage", None)
+    inp = getattr(usage, "input_tokens", None) or getattr(usage, "prompt_tokens", 0) or 0
+    out = getattr(usage, "output_tokens", None) or getattr(usage, "completion_tokens", 0) or 0
+    return {"input_tokens": int(inp), "output_tokens": int(out)}
+
+def _call_model(client: Any, model: str, system: str, user_msg: str) -> Tuple[str, Dict[str, int]]:
     # 1) Responses API
     try:
         if getattr(client, "responses", None) is not None:
             resp = client.responses.create(
-                model=OPENAI_MODEL,
+                model=model,
                 input=[{"role":"system","content":system},
                        {"role":"user","content":user_msg}],
                 response_format={"type":"json_object"},
@@ -254,38 +277,94 @@ def grade_all(q1: str, q2_1: str, q2_2: str, q3: str) -> Dict[str, Any]:
                                 parts.append(c.text)
                 txt="".join(parts) if parts else ""
             if not txt: raise RuntimeError("빈 응답")
+            return txt, _usage_of(resp)
         else:
             raise AttributeError("Responses API not available")
     except Exception:
         # 2) Chat Completions (토큰 파라미터 없이)
         try:
             chat = client.chat.completions.create(
-                model=OPENAI_MODEL,
+                model=model,
                 messages=[{"role":"system","content":system},
                           {"role":"user","content":user_msg}],
                 response_format={"type":"json_object"},
             )
-            txt = chat.choices[0].message.content
         except Exception:
             chat = client.chat.completions.create(
-                model=OPENAI_MODEL,
+                model=model,
                 messages=[{"role":"system","content":system},
                           {"role":"user","content":user_msg}],
             )
-            txt = chat.choices[0].message.content
+        return chat.choices[0].message.content, _usage_of(chat)
+
+def _grade_tier(client: Any, tier: str, model: str, system: str, user_msg: str,
+                route: Dict[str, Any]) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """한 단계(fast/full) 채점. (정규화된 결과 또는 None, 재채점 사유)를 반환하고 route에 기록합니다.
+    호출이 예외로 끝나도 해당 시도의 지연 시간은 route에 남기고 예외를 다시 던집니다."""
+    t0 = time.perf_counter()
+    attempt: Dict[str, Any] = {"tier": tier, "model": model, "input_tokens": 0, "output_tokens": 0}
+    try:
+        with perf.span(f"openai.{tier}"):
+            txt, usage = _call_model(client, model, system, user_msg)
+        attempt.update(usage)
+    except Exception as e:
+        attempt["error"] = type(e).__name__
+        raise
+    finally:
+        attempt["latency_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        route["tiers"].append(attempt)
+    try:
+        raw = _parse_json_strict(txt)
+    except Exception as e:
+        return None, [f"parse:{e}"]
+    reasons = grading.escalation_reasons(raw)
+    return grading.normalize(raw), reasons
+
+def _record_route(route: Dict[str, Any]) -> None:
+    """라우팅 결정·지연·토큰 사용량을 프로세스 공용 기록(grading.recent_routes)과 선택적 JSONL 파일에 남깁니다."""
+    route["total_ms"] = round(sum(t["latency_ms"] for t in route["tiers"]), 1)
+    grading.record_route(route)
+    if GRADING_LOG_PATH:
+        try:
+            perf.append_lines(GRADING_LOG_PATH, [json.dumps(route, ensure_ascii=False)])
+        except OSError:
+            pass
+
+def grade_all(q1: str, q2_1: str, q2_2: str, q3: str) -> Dict[str, Any]:
+    client = get_openai_client()
+    system, user_msg = build_messages({"q1": q1, "q2_1": q2_1, "q2_2": q2_2, "q3": q3})
+    route: Dict[str, Any] = {"ts": datetime.now().isoformat(timespec="seconds"), "mode": GRADING_MODE,
+                             "tiers": [], "escalated": False, "reasons": []}
 
+    fast_data: Optional[Dict[str, Any]] = None  # 스키마가 유효한 1차 결과(2차 실패 시 대체용)
     try:
-        data = _parse_json_strict(txt)
-        for key in ("q1","q2_1","q2_2","q3"):
-            item = data.get(key, {}) if isinstance(data, dict) else {}
-            lv = str(item.get("level","D")).upper()
-            if lv not in ("A","B","C","D"): lv="D"
-            item["level"]=lv; item.setdefault("feedback",""); item.setdefault("detected",{})
-            data[key]=item
+        # 1차: 경량 모델 — 플래그·등급이 일치하고 A/D로 확정되면 그대로 사용
+        if GRADING_MODE == "tiered" and OPENAI_FAST_MODEL != OPENAI_MODEL:
+            try:
+                data, reasons = _grade_tier(client, "fast", OPENAI_FAST_MODEL, system, user_msg, route)
+            except Exception as e:
+                data, reasons = None, [f"error:{type(e).__name__}"]
+            if data is not None and not reasons:
+                return data
+            if data is not None and not any(r.endswith(":schema") for r in reasons):
+                fast_data = data
+            route["escalated"] = True; route["reasons"] = reasons
+
+        # 2차(또는 full 모드): 대형 모델
+        try:
+            data, reasons = _grade_tier(client, "full", OPENAI_MODEL, system, user_msg, route)
+        except Exception:
+            if fast_data is None: raise
+            data, reasons = None, ["error"]
+        if data is None and fast_data is not None:
+            route["fallback"] = "fast"
+            return fast_data
+        if data is None:
+            st.error(f"[채점] 응답 파싱 실패: {reasons[0].split(':', 1)[-1]}")
+            return {k:{"level":"D","feedback":"시스템 오류로 간단 채점.","detected":{}} for k in grading.QKEYS}
         return data
-    except Exception as e:
-        st.error(f"[채점] 응답 파싱 실패: {e}")
-        return {k:{"level":"D","feedback":"시스템 오류로 간단 채점.","detected":{}} for k in ("q1","q2_1","q2_2","q3")}
+    finally:
+        _record_route(route)
 
 # ───────────────────────── 입력 폼 ─────────────────────────
 st.subheader("① 기본 정보")
@@ -380,8 +459,9 @@ if "opinion_target_id" not in st.session_state:
 if submit:
     if not validate_all():
         st.stop()
-    with st.spinner("채점 중…"):
+    with st.spinner("채점 중…"):  # OpenAI 시간은 grade_all 내부의 openai.fast/openai.full span으로 기록
         result = grade_all(ans1, ans2a, ans2b, ans3)
+    render_routes()
 
     st.success("채점이 완료되었습니다. 아래 성취수준과 피드백을 확인하세요.")
     tab1, tab2, tab3, tab4 = st.tabs(["문항 1", "문항 2-1", "문항 2-2", "문항 3"])
@@ -431,3 +511,5 @@ if st.session_state.get("ready_for_opinion"):
                 st.success("의견이 저장되었습니다.")
         else:
             st.warning("의견이 비어 있습니다.")
+
+perf.finish_rerun()
@@ -0,0 +1,252 @@
+# perf.py — 리런 단위 구간(span) 시간 측정 · 교사용 사이드바 패널 · JSONL/Prometheus 내보내기
+# -------------------------------------------------------------------------
+# 사용법(각 페이지):
+#   import perf
+#   perf.start_rerun("graph")          # 스크립트 맨 위
+#   with perf.span("get_dashboard_data"):
+#       ...
+#   perf.finish_rerun()                # 스크립트 맨 끝
+#
+# secrets(선택):
+#   TEACHER_PASSWORD = "..."           # 설정 시에만 사이드바 성능 패널 표시
+#   PERF_EXPORT_DIR  = "perf_logs"     # 내보내기 파일 저장 위치
+#   PERF_LOG_PATH    = "perf_logs/reruns.jsonl"  # 설정 시 매 리런을 자동 기록
+#
+# 콜드 스타트: STARTUP에 프로세스 단위(모든 세션 공유)로 무거운 import·DB 연결·페이지별 첫 리런 시간을 남깁니다.
+#   ready_since_start.<page>: 프로세스(streamlit run) 시작 → 해당 페이지 첫 리런 완료(/proc 기준)
+#   /proc가 없는 환경에서는 ready_since_import.<page>(이 모듈 import → 첫 리런 완료)로 대신 기록합니다.
+# -------------------------------------------------------------------------
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import streamlit as st
+
+MAX_RERUNS = 20          # 세션당 보관할 최근 리런 수
+TOP_SPANS = 5            # 패널에 표시할 느린 구간 수
+_CUR = "_perf_current"
+_HIST = "_perf_history"
+_TEACHER = "_perf_teacher"
+
+def _process_start() -> tuple:
+    """(프로세스 시작 시각(epoch 초), 지표 접두어). /proc를 읽을 수 없으면 이 모듈의 import 시각을 씁니다."""
+    try:
+        with open("/proc/self/stat", encoding="ascii") as f:
+            # comm(2번째 필드)에 공백이 있을 수 있으므로 마지막 ')' 뒤에서 나눔 → starttime(22번째)은 [19]
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", encoding="ascii") as f:
+            uptime = float(f.read().split()[0])
+        return time.time() - uptime + start_ticks / os.sysconf("SC_CLK_TCK"), "ready_since_start"
+    except (OSError, ValueError, IndexError):
+        return time.time(), "ready_since_import"
+
+
+_PROC_START, _READY_METRIC = _process_start()
+STARTUP: Dict[str, float] = {}          # 단계명 → ms (처음 한 번만 기록)
+_STARTUP_LOCK = threading.Lock()        # 예열 스레드와 세션 스레드가 함께 접근
+
+
+def _secret(key: str, default: str = "") -> str:
+    try:
+        return str(st.secrets.get(key, default))
+    except Exception:  # secrets.toml 없음
+        return default
+
+
+def start_rerun(page: str) -> None:
+    """리런 측정을 시작합니다. 직전 리런이 st.stop() 등으로 마감되지 않았다면 먼저 마감합니다."""
+    if st.session_state.get(_CUR):
+        finish_rerun(interrupted=True)
+    now = time.perf_counter()
+    st.session_state[_CUR] = {
+        "page": page,
+        "ts": datetime.now().isoformat(timespec="seconds"),
+        "t0": now, "t_last": now, "spans": [],
+    }
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """with 블록의 소요 시간을 현재 리런에 기록합니다(리런 밖에서는 측정만 생략)."""
+    cur = st.session_state.get(_CUR)
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        if cur is not None:
+            t1 = time.perf_counter()
+            cur["spans"].append({"name": name, "ms": round((t1 - t0) * 1000, 2)})
+            cur["t_last"] = t1
+
+
+@contextmanager
+def startup_step(name: str) -> Iterator[None]:
+    """프로세스에서 처음 실행될 때의 소요 시간만 STARTUP에 기록합니다(import·연결 등 1회성 비용)."""
+    with _STARTUP_LOCK:
+        done = name in STARTUP
+    if done:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        with _STARTUP_LOCK:
+            STARTUP.setdefault(name, round((time.perf_counter() - t0) * 1000, 2))
+
+
+def startup_items() -> List[tuple]:
+    """STARTUP의 (단계명, ms) 스냅샷. 순회 중 다른 스레드의 기록과 충돌하지 않습니다."""
+    with _STARTUP_LOCK:
+        return list(STARTUP.items())
+
+
+def finish_rerun(interrupted: bool = False) -> Optional[Dict[str, Any]]:
+    """현재 리런을 마감해 기록에 추가합니다. 중간에 끊긴 리런은 마지막 span 종료 시각까지로 계산합니다."""
+    cur = st.session_state.pop(_CUR, None)
+    if not cur:
+        return None
+    t0, t_last = cur.pop("t0"), cur.pop("t_last")
+    now = time.perf_counter()
+    end = t_last if interrupted else now
+    cur["total_ms"] = round((end - t0) * 1000, 2)
+    cur["interrupted"] = interrupted
+    with _STARTUP_LOCK:
+        if f"first_rerun.{cur['page']}" not in STARTUP:
+            STARTUP[f"first_rerun.{cur['page']}"] = cur["total_ms"]
+            end_wall = time.time() - (now - end)
+            STARTUP[f"{_READY_METRIC}.{cur['page']}"] = round((end_wall - _PROC_START) * 1000, 2)
+    hist: List[Dict[str, Any]] = st.session_state.setdefault(_HIST, [])
+    hist.append(cur)
+    del hist[:-MAX_RERUNS]
+
+    log_path = _secret("PERF_LOG_PATH")
+    if log_path:
+        try:
+            append_lines(log_path, [json.dumps(cur, ensure_ascii=False)])
+        except OSError:
+            pass
+    return cur
+
+
+def aggregate(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """같은 이름의 span을 합산(합계·횟수·최대)하여 합계 내림차순으로 반환합니다."""
+    agg: Dict[str, Dict[str, float]] = defaultdict(lambda: {"ms": 0.0, "count": 0, "max_ms": 0.0})
+    for s in spans:
+        a = agg[s["name"]]
+        a["ms"] += s["ms"]; a["count"] += 1; a["max_ms"] = max(a["max_ms"], s["ms"])
+    rows = [{"name": k, "ms": round(v["ms"], 2), "count": v["count"], "max_ms": v["max_ms"]}
+            for k, v in agg.items()]
+    return sorted(rows, key=lambda r: r["ms"], reverse=True)
+
+
+def history() -> List[Dict[str, Any]]:
+    return list(st.session_state.get(_HIST, []))
+
+
+# ---------- 내보내기 ----------
+def append_lines(path: str, lines: List[str]) -> None:
+    """JSONL 등 줄 단위 로그를 덧붙입니다(상위 폴더가 없으면 생성)."""
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("".join(line + "\n" for line in lines))
+
+
+def to_prometheus(reruns: List[Dict[str, Any]]) -> str:
+    """리런/구간 시간을 Prometheus 텍스트 형식(summary의 _sum/_count)으로 변환합니다."""
+    rerun_sum: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])
+    span_sum: Dict[tuple, List[float]] = defaultdict(lambda: [0.0, 0])
+    for r in reruns:
+        rerun_sum[r["page"]][0] += r["total_ms"] / 1000; rerun_sum[r["page"]][1] += 1
+        for s in r["spans"]:
+            key = (r["page"], s["name"])
+            span_sum[key][0] += s["ms"] / 1000; span_sum[key][1] += 1
+
+    def esc(v: str) -> str:
+        return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    out = ["# HELP portal_rerun_seconds Streamlit rerun wall time.",
+           "# TYPE portal_rerun_seconds summary"]
+    for page, (total, n) in sorted(rerun_sum.items()):
+        out.append(f'portal_rerun_seconds_sum{{page="{esc(page)}"}} {total:.6f}')
+        out.append(f'portal_rerun_seconds_count{{page="{esc(page)}"}} {n}')
+    out += ["# HELP portal_startup_seconds One-time startup step durations for this process.",
+            "# TYPE portal_startup_seconds gauge"]
+    for name, ms in sorted(startup_items()):
+        out.append(f'portal_startup_seconds{{step="{esc(name)}"}} {ms / 1000:.6f}')
+    out += ["# HELP portal_span_seconds Time spent in instrumented spans.",
+            "# TYPE portal_span_seconds summary"]
+    for (page, name), (total, n) in sorted(span_sum.items()):
+        labels = f'page="{esc(page)}",span="{esc(name)}"'
+        out.append(f"portal_span_seconds_sum{{{labels}}} {total:.6f}")
+        out.append(f"portal_span_seconds_count{{{labels}}} {n}")
+    return "\n".join(out) + "\n"
+
+
+def export(fmt: str) -> str:
+    """세션의 최근 리런 기록을 로컬 파일로 내보내고 경로를 반환합니다(fmt: "jsonl" | "prom")."""
+    reruns = history()
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    base = _secret("PERF_EXPORT_DIR", "perf_logs")
+    if fmt == "prom":
+        path = os.path.join(base, f"perf-{stamp}.prom")
+        os.makedirs(base, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(to_prometheus(reruns))
+    else:
+        path = os.path.join(base, f"perf-{stamp}.jsonl")
+        append_lines(path, [json.dumps(r, ensure_ascii=False) for r in reruns])
+    return path
+
+
+# ---------- 교사용 패널 ----------
+def is_teacher() -> bool:
+    return bool(st.session_state.get(_TEACHER))
+
+
+def render_panel() -> bool:
+    """TEACHER_PASSWORD가 설정된 경우에만 사이드바에 성능 패널을 표시합니다. 교사 인증 여부를 반환합니다."""
+    password = _secret("TEACHER_PASSWORD")
+    if not password:
+        return False
+    with st.sidebar.expander("⏱️ 성능 패널(교사용)", expanded=False):
+        if not is_teacher():
+            entered = st.text_input("교사 비밀번호", type="password", key="_perf_pw")
+            if entered and entered == password:
+                st.session_state[_TEACHER] = True
+            else:
+                return False
+
+        reruns = history()
+        if not reruns:
+            st.caption("아직 기록된 리런이 없습니다.")
+        for r in reversed(reruns):
+            mark = " (중단)" if r.get("interrupted") else ""
+            st.markdown(f"**{r['ts']} · {r['page']} · {r['total_ms']:.0f} ms{mark}**")
+            for s in aggregate(r["spans"])[:TOP_SPANS]:
+                cnt = f" ×{s['count']}" if s["count"] > 1 else ""
+                st.caption(f"{s['name']}{cnt}: {s['ms']:.1f} ms")
+
+        startup = startup_items()
+        if startup:
+            st.markdown("**콜드 스타트(프로세스)**")
+            for name, ms in startup:
+                st.caption(f"{name}: {ms:.1f} ms")
+
+        c1, c2 = st.columns(2)
+        with c1:
+            if st.button("JSONL 저장", key="_perf_export_jsonl", disabled=not reruns):
+                st.success(f"저장: {export('jsonl')}")
+        with c2:
+            if st.button("Prometheus 저장", key="_perf_export_prom", disabled=not reruns):
+                st.success(f"저장: {export('prom')}")
+    return True
@@ -0,0 +1,142 @@
+# portal.py — 페이지 공용 리소스(DB 연결)와 Home에서의 백그라운드 예열
+# -------------------------------------------------------------------------
+#  - get_connection(): 모든 페이지가 같은 st.connection을 공유(헬스체크 결과도 캐시됨)
+#  - 그래프 차시 데이터: get_dashboard_data / get_activity_ids(차시별 캐시),
+#    register_student / upsert_graph(제출 쓰기), invalidate_activity(제출 후 해당 차시 캐시만 비움)
+#    → 그래프 페이지와 bench/classroom.py가 같은 조회·무효화 경로를 사용
+#  - prewarm(): 프로세스당 1회, 무거운 모듈 import와 DB 연결을 백그라운드 스레드에서 미리 수행
+#               → 학생이 페이지를 처음 열 때의 대기 시간 단축. 소요 시간은 perf.STARTUP에 기록
+#               예열 스레드는 Home 리런보다 오래 살 수 있으므로 ScriptRunContext를 붙이지 않고
+#               스피너도 끕니다(끝난 리런에 UI 메시지를 보내지 않도록).
+# -------------------------------------------------------------------------
+from __future__ import annotations
+
+import importlib
+import threading
+from typing import Any, List, Optional, Tuple
+
+import streamlit as st
+
+import perf
+
+HEAVY_MODULES = ("pandas", "sqlalchemy", "pymysql", "altair", "openai")
+
+_prewarm_lock = threading.Lock()
+_prewarm_thread: Optional[threading.Thread] = None
+
+
+def get_connection() -> Tuple[Optional[Any], str]:
+    """(conn, DB_STATUS)를 반환합니다. 연결 실패 시 (None, "OFFLINE: ...")."""
+    try:
+        with perf.startup_step("db.connect"):
+            creds = st.secrets.connections.mysql
+            conn = st.connection(
+                "mysql", type="sql", dialect="mysql",
+                host=creds.host, port=creds.port, database=creds.database,
+                username=creds.user, password=creds.password
+            )
+            conn.query("SELECT 1;", show_spinner=False)  # 헬스체크(결과가 캐시되어 이후 리런에서는 DB 왕복 없음)
+        return conn, "ONLINE"
+    except Exception as e:
+        return None, f"OFFLINE: {e}"
+
+
+# ---------- 그래프 차시 데이터 (그래프 페이지·벤치마크 공용) ----------
+# 내부 conn.query는 ttl=0으로 두고 바깥 st.cache_data만 캐시로 사용합니다.
+# → 제출 시 해당 차시 항목만 지워도(invalidate_activity) 최신 데이터가 보장됩니다.
+@st.cache_data(ttl=300, max_entries=32)
+def get_dashboard_data(activity_id: str):
+    """대시보드와 학생 상세 탭에 필요한 데이터를 DB에서 조회합니다."""
+    import pandas as pd
+    conn, _ = get_connection()
+    if not conn:
+        return pd.DataFrame()
+
+    df = conn.query(
+        """
+        SELECT g1.id, s.name, s.grade, s.class, g1.submitted_at, g1.data_json
+        FROM graph1 g1
+        JOIN students s ON s.id = g1.id
+        WHERE g1.activity_id = :activity_id;
+        """,
+        params={"activity_id": activity_id},
+        ttl=0,
+    )
+    # 학번, 학년, 반을 숫자 타입으로 변환하여 정렬이 올바르게 되도록 함
+    for col in ['id', 'grade', 'class']:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df.sort_values('id')
+
+
+@st.cache_data(ttl=3600)
+def get_activity_ids() -> List[str]:
+    """제출이 있는 차시 목록. 선택 상자용이라 오래 캐시하고, 새 차시에 첫 제출이 들어올 때만 비웁니다."""
+    conn, _ = get_connection()
+    if not conn:
+        return []
+    df = conn.query("SELECT DISTINCT activity_id FROM graph1;", ttl=0)
+    return df["activity_id"].astype(str).tolist()
+
+
+def register_student(session: Any, sid: str, name: str) -> bool:
+    """students에 없으면 등록하고 커밋합니다. 새로 등록했으면 True."""
+    from sqlalchemy import text
+    if session.execute(text("SELECT 1 FROM students WHERE id=:id"), {"id": sid}).first():
+        return False
+    # id와 name만 INSERT합니다. grade와 class는 DB에서 자동으로 생성됩니다.
+    session.execute(text("INSERT INTO students (id, name) VALUES (:id, :name);"), {"id": sid, "name": name})
+    session.commit()
+    return True
+
+
+def upsert_graph(session: Any, activity_id: str, sid: str, payload: str) -> None:
+    """차시별 최신 1건 유지(UPSERT) 후 커밋합니다."""
+    from sqlalchemy import text
+    session.execute(
+        text("""
+        INSERT INTO graph1(activity_id, id, data_json) VALUES (:activity_id, :id, :data_json)
+        ON DUPLICATE KEY UPDATE
+            data_json = VALUES(data_json),
+            submitted_at = CURRENT_TIMESTAMP
+        """),
+        {"activity_id": activity_id, "id": sid, "data_json": payload},
+    )
+    session.commit()
+
+
+def invalidate_activity(activity_id: str, new_activity: bool) -> None:
+    """제출 성공 후 이 차시의 캐시만 비웁니다(다른 차시·헬스체크·차시 요약 캐시는 유지).
+    new_activity이면 선택 상자의 차시 목록도 비웁니다."""
+    get_dashboard_data.clear(activity_id)
+    if new_activity:
+        get_activity_ids.clear()
+
+
+def _prewarm_worker() -> None:
+    for mod in HEAVY_MODULES:
+        with perf.startup_step(f"import.{mod}"):
+            try:
+                importlib.import_module(mod)
+            except ImportError:
+                pass
+    get_connection()
+
+
+def prewarm() -> None:
+    """프로세스에서 처음 호출될 때만 예열 스레드를 시작합니다(이후 호출은 무시)."""
+    global _prewarm_thread
+    with _prewarm_lock:
+        if _prewarm_thread is not None:
+            return
+        _prewarm_thread = threading.Thread(target=_prewarm_worker, name="portal-prewarm", daemon=True)
+        _prewarm_thread.start()
+
+
+def wait_prewarm(timeout: Optional[float] = None) -> bool:
+    """예열이 끝날 때까지 기다립니다(벤치마크용). 예열을 시작하지 않았거나 끝났으면 True."""
+    t = _prewarm_thread
+    if t is not None:
+        t.join(timeout)
+        return not t.is_alive()
+    return True
@@ -0,0 +1,67 @@
+import copy
+
+import pytest
+
+import grading
+
+CLEAR_A = {
+    "q1":   {"level": "A", "detected": {"grouping_correct": True, "mentions_inout": True, "criterion_sentence": True}},
+    "q2_1": {"level": "A", "detected": {"state_liq_to_sol": True, "type_const": True, "count_const": True,
+                                        "distance_decrease": True, "arrangement_regular": True}},
+    "q2_2": {"level": "A", "detected": {"state_liq_to_sol": True, "heat_release": True}},
+    "q3":   {"level": "A", "detected": {"camp_ok": 2}},
+}
+CLEAR_D = {
+    "q1":   {"level": "D", "detected": {"grouping_correct": False, "mentions_inout": False, "criterion_sentence": False}},
+    "q2_1": {"level": "D", "detected": {"state_liq_to_sol": False, "type_const": False, "count_const": False,
+                                        "distance_decrease": False, "arrangement_regular": False}},
+    "q2_2": {"level": "D", "detected": {"state_liq_to_sol": False, "heat_release": False}},
+    "q3":   {"level": "D", "detected": {"camp_ok": 0}},
+}
+
+
+@pytest.mark.parametrize("data", [CLEAR_A, CLEAR_D])
+def test_consistent_a_and_d_are_accepted(data):
+    assert grading.escalation_reasons(copy.deepcopy(data)) == []
+
+
+@pytest.mark.parametrize("level", ["B", "C"])
+def test_borderline_levels_escalate(level):
+    data = copy.deepcopy(CLEAR_A)
+    data["q2_2"]["level"] = level
+    assert grading.escalation_reasons(data) == ["q2_2:borderline"]
+
+
+def test_flag_level_mismatch_escalates():
+    data = copy.deepcopy(CLEAR_A)
+    data["q1"]["detected"]["criterion_sentence"] = False  # 2/3 → B 이어야 하는데 A
+    data["q3"]["level"] = "D"                             # camp_ok=2 → A 이어야 하는데 D
+    assert grading.escalation_reasons(data) == ["q1:mismatch", "q3:mismatch"]
+
+
+@pytest.mark.parametrize("camp_ok", [True, 3, -1, "2", 1.5])
+def test_invalid_camp_ok_is_schema_failure(camp_ok):
+    data = copy.deepcopy(CLEAR_A)
+    data["q3"]["detected"]["camp_ok"] = camp_ok
+    assert grading.escalation_reasons(data) == ["q3:schema"]
+
+
+def test_missing_item_or_non_object_is_schema_failure():
+    data = copy.deepcopy(CLEAR_A)
+    del data["q2_1"]
+    assert grading.escalation_reasons(data) == ["q2_1:schema"]
+    assert grading.escalation_reasons([]) == ["schema:not_object"]
+
+
+def test_normalize_fills_defaults_and_clamps_level():
+    out = grading.normalize({"q1": {"level": "a"}, "q2_1": {"level": "Z"}, "q3": "bad"})
+    assert out["q1"] == {"level": "A", "feedback": "", "detected": {}}
+    assert out["q2_1"]["level"] == "D"
+    assert out["q2_2"]["level"] == "D" and out["q3"]["level"] == "D"
+
+
+def test_recent_routes_keeps_last_max_routes(monkeypatch):
+    monkeypatch.setattr(grading, "_ROUTES", grading.deque(maxlen=3))
+    for i in range(5):
+        grading.record_route({"n": i})
+    assert [r["n"] for r in grading.recent_routes()] == [2, 3, 4]